@@ -1,11 +1,10 @@
 import argparse
 from pathlib import Path
 
-from yaml import safe_load
-
 from ..archive import Archive, ArchiveRecipe
 from ..command import BaseCommand
 from ..types import ConfigDict
+from ..utils import load_yaml
 
 
 class Command(BaseCommand):
@@ -24,7 +23,7 @@ class Command(BaseCommand):
 
         for recipe_file in self.options.export_path.iterdir():
             with open(recipe_file, "r") as inf:
-                archive.add_recipe(ArchiveRecipe.from_dict(safe_load(inf)))
+                archive.add_recipe(ArchiveRecipe.from_dict(load_yaml(inf)))
 
         with open(self.options.archive_path, "wb") as outf:
             archive.as_paprikarecipes(outf)
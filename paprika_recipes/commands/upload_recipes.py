@@ -2,12 +2,11 @@ import argparse
 from pathlib import Path
 
 from rich.progress import track
-from yaml import safe_load
 
 from ..command import RemoteCommand
 from ..remote import RemoteRecipe
 from ..types import ConfigDict
-from ..utils import dump_recipe_yaml
+from ..utils import dump_recipe_yaml, load_yaml
 
 
 class Command(RemoteCommand):
@@ -26,7 +25,7 @@ class Command(RemoteCommand):
 
         for recipe_file in track(files, description="Uploading Recipes"):
             with open(recipe_file, "r") as inf:
-                uploaded = remote.upload_recipe(RemoteRecipe.from_dict(safe_load(inf)))
+                uploaded = remote.upload_recipe(RemoteRecipe.from_dict(load_yaml(inf)))
 
             with open(recipe_file, "w") as outf:
                 dump_recipe_yaml(uploaded, outf)
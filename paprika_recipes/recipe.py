@@ -1,15 +1,23 @@
 from __future__ import annotations
 
 import datetime
-import gzip
 import hashlib
 import json
 import uuid
 from dataclasses import asdict, dataclass, field, fields
-from typing import IO, Any, Dict, List, Type, TypeVar
+from typing import IO, Any, Dict, List, Literal, Type, TypeVar
+
+import orjson
 
 from .types import UNKNOWN
 
+try:
+    # ISA-L's gzip implementation is several times faster than zlib's and
+    # produces ordinary gzip streams, so prefer it when it's installed.
+    from isal import igzip as gzip
+except ImportError:
+    import gzip  # type: ignore
+
 T = TypeVar("T", bound="BaseRecipe")
 
 
@@ -61,7 +69,10 @@ class BaseRecipe:
         return cls(**data)
 
     def as_paprikarecipe(self) -> bytes:
-        return gzip.compress(self.as_json().encode("utf-8"))
+        return gzip.compress(self._as_json_bytes())
+
+    def _as_json_bytes(self) -> bytes:
+        return orjson.dumps(self.as_dict())
 
     def as_json(self):
         return json.dumps(self.as_dict())
@@ -69,13 +80,22 @@ class BaseRecipe:
     def as_dict(self):
         return asdict(self)
 
-    def calculate_hash(self) -> str:
+    def calculate_hash(
+        self, algorithm: Literal["sha256", "blake2b"] = "sha256"
+    ) -> str:
         fields = self.as_dict()
         fields.pop("hash", None)
 
-        return hashlib.sha256(
-            json.dumps(fields, sort_keys=True).encode("utf-8")
-        ).hexdigest()
+        blob = json.dumps(fields, sort_keys=True).encode("utf-8")
+
+        if algorithm == "sha256":
+            return hashlib.sha256(blob).hexdigest()
+        elif algorithm == "blake2b":
+            # BLAKE2b is faster than SHA-256 on CPUs without SHA extensions;
+            # ask for a 32-byte digest so the hash is as long as SHA-256's.
+            return hashlib.blake2b(blob, digest_size=32).hexdigest()
+
+        raise ValueError(f"Unsupported hash algorithm: {algorithm}")
 
     def update_hash(self):
         self.hash = self.calculate_hash()
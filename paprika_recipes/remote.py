@@ -26,7 +26,7 @@ class RemoteRecipe(BaseRecipe):
 
 class Remote(RecipeManager):
     _bearer_token: Optional[str] = None
-    _last_request_time: float = 0.0
+    _last_request_time: float = float("-inf")
 
     _domain: str
     _email: str
@@ -108,7 +108,7 @@ class Remote(RecipeManager):
     def _request(self, method, path, authenticated=True, **kwargs):
         # Rate limiting: ensure minimum interval between requests
         if self._min_request_interval > 0:
-            elapsed = time.time() - self._last_request_time
+            elapsed = time.monotonic() - self._last_request_time
             if elapsed < self._min_request_interval:
                 time.sleep(self._min_request_interval - elapsed)
 
@@ -117,7 +117,7 @@ class Remote(RecipeManager):
                 "Authorization"
             ] = f"Bearer {self.bearer_token}"
         result = requests.request(method, f"https://{self._domain}{path}", **kwargs)
-        self._last_request_time = time.time()
+        self._last_request_time = time.monotonic()
         result.raise_for_status()
 
         if "error" in result.json():
@@ -1,11 +1,11 @@
+import io
 import os
-import re
 import subprocess
 import tempfile
 from collections import OrderedDict
 from pathlib import Path
 from textwrap import dedent
-from typing import TYPE_CHECKING, Any, List, TypeVar, cast
+from typing import IO, TYPE_CHECKING, Any, List, Optional, TypeVar, Union, cast
 
 import keyring
 import yaml
@@ -16,14 +16,18 @@ from .exceptions import AuthenticationError, PaprikaUserError
 from .types import ConfigDict
 
 
+# Forward/back slashes become dashes; other problematic characters
+# become underscores.
+_FILENAME_TRANSLATION = str.maketrans(
+    {**{char: "-" for char in "/\\"}, **{char: "_" for char in '<>:"|?*'}}
+)
+
+
 def sanitize_filename(name: str) -> str:
     """Sanitize a string to be safe for use as a filename."""
-    # Replace forward/back slashes with dashes
-    name = re.sub(r'[/\\]', '-', name)
-    # Replace other problematic characters
-    name = re.sub(r'[<>:"|?*]', '_', name)
+    name = name.translate(_FILENAME_TRANSLATION)
     # Remove leading/trailing whitespace and dots
-    name = name.strip(' .')
+    name = name.strip(" .")
     return name
 
 if TYPE_CHECKING:
@@ -48,9 +52,22 @@ def ordereddict_representer(dumper, data):
     return yaml.nodes.MappingNode("tag:yaml.org,2002:map", value)
 
 
-yaml.add_representer(OrderedDict, ordereddict_representer)
+# Resolve the loader once at import time, preferring the libyaml bindings
+# when they are available; they're considerably faster than the
+# pure-python implementation and parse documents identically.
+_Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+# The dumper stays pure-python: libyaml's emitter escapes characters
+# outside the BMP (e.g. emoji) and falls back to double-quoted scalars,
+# which defeats the block style `str_representer` asks for.
+class _Dumper(yaml.Dumper):
+    pass
+
 
-yaml.add_representer(str, str_representer)
+_Dumper.add_representer(OrderedDict, ordereddict_representer)
+
+_Dumper.add_representer(str, str_representer)
 
 
 def dump_recipe_yaml(recipe: "BaseRecipe", *args: Any):
@@ -77,15 +94,28 @@ def dump_recipe_yaml(recipe: "BaseRecipe", *args: Any):
     dump_yaml(recipe_dict, *args)
 
 
-def dump_yaml(*args: Any):
-    # We're using a custom presenter, so we have to use `yaml.dump`
-    # instead of `yaml.safe_dump` -- that's OK, though -- we still use
-    # `safe_load`, which is where the actual risks are.
-    yaml.dump(*args, allow_unicode=True)
+def _is_binary_stream(stream: Optional[IO]) -> bool:
+    if isinstance(stream, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+
+    # Wrappers such as `tempfile.NamedTemporaryFile` aren't `IOBase`
+    # subclasses, but do expose the mode they were opened with.
+    mode = getattr(stream, "mode", "")
+    return isinstance(mode, str) and "b" in mode
+
+
+def dump_yaml(data: Any, stream: Optional[IO] = None):
+    # Binary streams get UTF-8 straight from the emitter instead of
+    # having it written as text and encoded again.
+    encoding = "utf-8" if _is_binary_stream(stream) else None
+    # We're using a custom presenter, so we have to use a full `Dumper`
+    # instead of `SafeDumper` -- that's OK, though -- we still use
+    # a safe loader, which is where the actual risks are.
+    yaml.dump(data, stream, Dumper=_Dumper, allow_unicode=True, encoding=encoding)
 
 
-def load_yaml(*args: Any) -> Any:
-    return yaml.safe_load(*args)
+def load_yaml(stream: Union[str, bytes, IO]) -> Any:
+    return yaml.load(stream, Loader=_Loader)
 
 
 def get_password_for_email(email: str) -> str:
@@ -133,7 +163,7 @@ def edit_recipe_interactively(recipe: T, editor="vim") -> T:
 
         outf.seek(0)
 
-        return recipe.__class__.from_dict(yaml.safe_load(outf))
+        return recipe.__class__.from_dict(load_yaml(outf))
 
 
 def get_config_dir() -> Path:
@@ -1,79 +1,98 @@
 """Data integrity tests for recipe round-trip serialization."""
 
+import copy
 import gzip
+import hashlib
 import io
 import json
 import os
+import tempfile
 from pathlib import Path
 
 import pytest
 
 from paprika_recipes.recipe import BaseRecipe
-from paprika_recipes.utils import dump_recipe_yaml, load_yaml
+from paprika_recipes.utils import dump_recipe_yaml, load_yaml, sanitize_filename
 
 
 # Path to real recipe data for integration tests
 REAL_RECIPES_DIR = Path(__file__).parent.parent.parent / "paprika-sync" / "test-download"
 
 
+# Globbed once at collection time; shared by every test and parametrization
+_RECIPE_FILES = (
+    sorted(REAL_RECIPES_DIR.glob("*.paprikarecipe.yaml"))
+    if REAL_RECIPES_DIR.exists()
+    else []
+)
+
+
+# Parsed real recipe files, shared by every TestRealRecipeData method
+_PARSED_RECIPE_FILES = {}
+
+
+def _load_recipe_file(path: Path):
+    """Parse a real recipe file once; return a fresh copy on every call."""
+    if path not in _PARSED_RECIPE_FILES:
+        _PARSED_RECIPE_FILES[path] = load_yaml(path.read_bytes())
+    return copy.deepcopy(_PARSED_RECIPE_FILES[path])
+
+
+@pytest.fixture(scope="class")
+def clear_parsed_recipe_files():
+    """Release parsed recipes (and their photo data) after the class using this."""
+    yield
+    _PARSED_RECIPE_FILES.clear()
+
+
+def _round_trip(recipe: BaseRecipe) -> BaseRecipe:
+    """Dump a recipe to YAML and load it back."""
+    buffer = io.BytesIO()
+    dump_recipe_yaml(recipe, buffer)
+    buffer.seek(0)
+    return BaseRecipe.from_dict(load_yaml(buffer))
+
+
+@pytest.fixture(scope="module")
+def full_recipe():
+    """A recipe with every user-editable field populated.
+
+    Shared by every test in the module; tests that mutate it must work on
+    a ``copy.deepcopy``, since a shallow copy would share ``categories``.
+    """
+    return BaseRecipe(
+        name="Test Recipe",
+        description="A test description",
+        ingredients="1 cup flour\n2 eggs",
+        directions="Mix well.\nBake at 350F.",
+        notes="Some notes here",
+        nutritional_info="100 calories per serving",
+        categories=["cat-uuid-1", "cat-uuid-2"],
+        cook_time="30 minutes",
+        difficulty="easy",
+        image_url="https://example.com/image.jpg",
+        prep_time="15 minutes",
+        rating=4,
+        servings="4",
+        source="Test Kitchen",
+        source_url="https://example.com/recipe",
+        total_time="45 minutes",
+    )
+
+
 class TestYamlRoundTrip:
     """Test that YAML serialization/deserialization preserves all data."""
 
-    def test_all_fields_preserved_after_round_trip(self):
+    def test_all_fields_preserved_after_round_trip(self, full_recipe):
         """All recipe fields should survive YAML round-trip."""
-        original = BaseRecipe(
-            name="Test Recipe",
-            description="A test description",
-            ingredients="1 cup flour\n2 eggs",
-            directions="Mix well.\nBake at 350F.",
-            notes="Some notes here",
-            nutritional_info="100 calories per serving",
-            categories=["cat-uuid-1", "cat-uuid-2"],
-            cook_time="30 minutes",
-            difficulty="easy",
-            image_url="https://example.com/image.jpg",
-            prep_time="15 minutes",
-            rating=4,
-            servings="4",
-            source="Test Kitchen",
-            source_url="https://example.com/recipe",
-            total_time="45 minutes",
-        )
-        # Capture the auto-generated fields
-        original_uid = original.uid
-        original_hash = original.hash
-        original_created = original.created
-
-        # Serialize to YAML
-        buffer = io.StringIO()
-        dump_recipe_yaml(original, buffer)
-        yaml_content = buffer.getvalue()
+        original = full_recipe
+        expected = original.as_dict()
 
-        # Deserialize back
-        buffer.seek(0)
-        loaded_dict = load_yaml(buffer)
-        restored = BaseRecipe.from_dict(loaded_dict)
+        restored = _round_trip(original)
 
-        # Verify all fields match
-        assert restored.name == "Test Recipe"
-        assert restored.description == "A test description"
-        assert restored.ingredients == "1 cup flour\n2 eggs"
-        assert restored.directions == "Mix well.\nBake at 350F."
-        assert restored.notes == "Some notes here"
-        assert restored.nutritional_info == "100 calories per serving"
-        assert restored.categories == ["cat-uuid-1", "cat-uuid-2"]
-        assert restored.cook_time == "30 minutes"
-        assert restored.difficulty == "easy"
-        assert restored.image_url == "https://example.com/image.jpg"
-        assert restored.prep_time == "15 minutes"
-        assert restored.rating == 4
-        assert restored.servings == "4"
-        assert restored.source == "Test Kitchen"
-        assert restored.source_url == "https://example.com/recipe"
-        assert restored.total_time == "45 minutes"
-        assert restored.uid == original_uid
-        assert restored.hash == original_hash
-        assert restored.created == original_created
+        # Verify all fields match, including the auto-generated uid, hash
+        # and created timestamp
+        assert restored.as_dict() == expected
 
     def test_unicode_characters_preserved(self):
         """Unicode characters in ingredients and directions should survive round-trip."""
@@ -84,11 +103,7 @@ class TestYamlRoundTrip:
             notes="Très délicieux! 美味しい! Вкусно!",
         )
 
-        buffer = io.StringIO()
-        dump_recipe_yaml(original, buffer)
-        buffer.seek(0)
-        loaded_dict = load_yaml(buffer)
-        restored = BaseRecipe.from_dict(loaded_dict)
+        restored = _round_trip(original)
 
         assert restored.name == "Crème Brûlée"
         assert "crème fraîche" in restored.ingredients
@@ -98,6 +113,49 @@ class TestYamlRoundTrip:
         assert "美味しい!" in restored.notes
         assert "Вкусно!" in restored.notes
 
+    @pytest.mark.parametrize(
+        "make_stream",
+        [
+            io.StringIO,
+            io.BytesIO,
+            lambda: tempfile.NamedTemporaryFile("w+", encoding="utf-8"),
+            lambda: tempfile.NamedTemporaryFile("w+b"),
+        ],
+        ids=["StringIO", "BytesIO", "text-file", "binary-file"],
+    )
+    def test_round_trip_through_stream(self, make_stream):
+        """Recipes should round-trip through both text and binary streams."""
+        original = BaseRecipe(
+            name="Crème Brûlée",
+            ingredients="200g crème fraîche\n1 gousse de vanille",
+        )
+
+        with make_stream() as stream:
+            dump_recipe_yaml(original, stream)
+            stream.seek(0)
+            restored = BaseRecipe.from_dict(load_yaml(stream))
+
+        assert restored.as_dict() == original.as_dict()
+
+    def test_emoji_multiline_text_uses_block_style(self):
+        """Emoji in multiline text should be written unescaped in a block scalar."""
+        original = BaseRecipe(
+            name="Birthday Cake 🍰",
+            ingredients="1 cup flour 🌾\n2 eggs 🥚",
+        )
+
+        buffer = io.StringIO()
+        dump_recipe_yaml(original, buffer)
+        yaml_content = buffer.getvalue()
+
+        assert "ingredients: |-\n  1 cup flour 🌾\n  2 eggs 🥚\n" in yaml_content
+        assert "\\U" not in yaml_content
+
+        buffer.seek(0)
+        restored = BaseRecipe.from_dict(load_yaml(buffer))
+        assert restored.name == "Birthday Cake 🍰"
+        assert restored.ingredients == "1 cup flour 🌾\n2 eggs 🥚"
+
     def test_special_characters_in_name(self):
         """Special characters in recipe names should survive round-trip."""
         test_names = [
@@ -112,11 +170,7 @@ class TestYamlRoundTrip:
 
         for name in test_names:
             original = BaseRecipe(name=name)
-            buffer = io.StringIO()
-            dump_recipe_yaml(original, buffer)
-            buffer.seek(0)
-            loaded_dict = load_yaml(buffer)
-            restored = BaseRecipe.from_dict(loaded_dict)
+            restored = _round_trip(original)
             assert restored.name == name, f"Name '{name}' not preserved"
 
     def test_empty_and_null_fields_preserved(self):
@@ -149,17 +203,10 @@ class TestYamlRoundTrip:
             scale=None,
         )
 
-        buffer = io.StringIO()
-        dump_recipe_yaml(original, buffer)
-        buffer.seek(0)
-        loaded_dict = load_yaml(buffer)
-        restored = BaseRecipe.from_dict(loaded_dict)
+        restored = _round_trip(original)
 
-        assert restored.name == "Minimal Recipe"
-        assert restored.description == ""
-        assert restored.ingredients == ""
-        assert restored.categories == []
-        assert restored.rating == 0
+        assert restored.as_dict() == original.as_dict()
+        # Dict equality treats 0 == False, so check identities too
         assert restored.photo is None
         assert restored.photo_large is None
         assert restored.in_trash is False
@@ -178,11 +225,7 @@ class TestYamlRoundTrip:
             photo_hash="abc123",
         )
 
-        buffer = io.StringIO()
-        dump_recipe_yaml(original, buffer)
-        buffer.seek(0)
-        loaded_dict = load_yaml(buffer)
-        restored = BaseRecipe.from_dict(loaded_dict)
+        restored = _round_trip(original)
 
         assert restored.photo == test_photo
         assert restored.photo_hash == "abc123"
@@ -210,34 +253,53 @@ Step 3: Bake."""
             directions=directions,
         )
 
-        buffer = io.StringIO()
-        dump_recipe_yaml(original, buffer)
-        buffer.seek(0)
-        loaded_dict = load_yaml(buffer)
-        restored = BaseRecipe.from_dict(loaded_dict)
+        restored = _round_trip(original)
 
         assert restored.ingredients == ingredients
         assert restored.directions == directions
 
-    def test_hash_calculation_consistent(self):
+    def test_hash_calculation_consistent(self, full_recipe):
         """Hash should be calculable and consistent after round-trip."""
-        original = BaseRecipe(
-            name="Hash Test",
-            ingredients="1 cup test",
-            directions="Mix well",
-        )
+        original = full_recipe
         original_calculated = original.calculate_hash()
 
-        buffer = io.StringIO()
-        dump_recipe_yaml(original, buffer)
-        buffer.seek(0)
-        loaded_dict = load_yaml(buffer)
-        restored = BaseRecipe.from_dict(loaded_dict)
+        restored = _round_trip(original)
 
         restored_calculated = restored.calculate_hash()
         assert restored_calculated == original_calculated
 
 
+class TestHashCalculation:
+    """Test hash calculation algorithms."""
+
+    def canonical_json(self, recipe):
+        fields = recipe.as_dict()
+        fields.pop("hash")
+        return json.dumps(fields, sort_keys=True).encode("utf-8")
+
+    def test_default_hash_is_sha256_of_canonical_json(self, full_recipe):
+        """The default hash should be SHA-256 of the sorted JSON without ``hash``."""
+        expected = hashlib.sha256(self.canonical_json(full_recipe)).hexdigest()
+
+        assert full_recipe.calculate_hash() == expected
+        assert full_recipe.calculate_hash("sha256") == expected
+
+    def test_blake2b_hash(self, full_recipe):
+        """BLAKE2b should be a 32-byte digest of the same canonical JSON."""
+        expected = hashlib.blake2b(
+            self.canonical_json(full_recipe), digest_size=32
+        ).hexdigest()
+
+        assert full_recipe.calculate_hash("blake2b") == expected
+        assert len(expected) == 64
+
+    @pytest.mark.parametrize("algorithm", ["md5", "shake_128", "sha512", ""])
+    def test_unsupported_algorithm_raises(self, full_recipe, algorithm):
+        """Only sha256 and blake2b should be accepted."""
+        with pytest.raises(ValueError):
+            full_recipe.calculate_hash(algorithm)
+
+
 class TestPaprikaRecipeFormat:
     """Test .paprikarecipe format (gzipped JSON) round-trip."""
 
@@ -286,6 +348,33 @@ class TestPaprikaRecipeFormat:
         assert "Ελληνικά" in restored.notes
 
 
+    def test_paprikarecipe_payload_matches_as_dict(self):
+        """The decompressed payload should decode to exactly ``as_dict()``."""
+        original = BaseRecipe(
+            name="Crème Brûlée 🍮",
+            ingredients="200g crème fraîche\n1 gousse de vanille",
+            notes="日本語テスト Ελληνικά Вкусно",
+            categories=["catégorie-1"],
+        )
+
+        data = json.loads(gzip.decompress(original.as_paprikarecipe()))
+
+        assert data == original.as_dict()
+
+    @pytest.mark.parametrize("gzip_module", ["gzip", "isal.igzip"])
+    def test_paprikarecipe_gzip_implementations(self, monkeypatch, gzip_module):
+        """Both the stdlib and isal gzip paths should write standard gzip."""
+        from paprika_recipes import recipe as recipe_module
+
+        monkeypatch.setattr(recipe_module, "gzip", pytest.importorskip(gzip_module))
+        original = BaseRecipe(name="Crêpes Suzette", ingredients="Crème fraîche")
+
+        compressed = original.as_paprikarecipe()
+
+        assert json.loads(gzip.decompress(compressed)) == original.as_dict()
+        assert BaseRecipe.from_file(io.BytesIO(compressed)) == original
+
+
 class TestFieldTypeCoercion:
     """Test that field types are handled correctly."""
 
@@ -293,11 +382,7 @@ class TestFieldTypeCoercion:
         """Rating should remain an integer after round-trip."""
         original = BaseRecipe(name="Rating Test", rating=3)
 
-        buffer = io.StringIO()
-        dump_recipe_yaml(original, buffer)
-        buffer.seek(0)
-        loaded_dict = load_yaml(buffer)
-        restored = BaseRecipe.from_dict(loaded_dict)
+        restored = _round_trip(original)
 
         assert restored.rating == 3
         assert isinstance(restored.rating, int)
@@ -309,11 +394,7 @@ class TestFieldTypeCoercion:
             categories=["uuid-1", "uuid-2", "uuid-3"],
         )
 
-        buffer = io.StringIO()
-        dump_recipe_yaml(original, buffer)
-        buffer.seek(0)
-        loaded_dict = load_yaml(buffer)
-        restored = BaseRecipe.from_dict(loaded_dict)
+        restored = _round_trip(original)
 
         assert restored.categories == ["uuid-1", "uuid-2", "uuid-3"]
         assert isinstance(restored.categories, list)
@@ -322,11 +403,7 @@ class TestFieldTypeCoercion:
         """Empty categories should remain a list, not become None."""
         original = BaseRecipe(name="Empty Categories", categories=[])
 
-        buffer = io.StringIO()
-        dump_recipe_yaml(original, buffer)
-        buffer.seek(0)
-        loaded_dict = load_yaml(buffer)
-        restored = BaseRecipe.from_dict(loaded_dict)
+        restored = _round_trip(original)
 
         assert restored.categories == []
         assert isinstance(restored.categories, list)
@@ -335,49 +412,36 @@ class TestFieldTypeCoercion:
 class TestFilenameEdgeCases:
     """Test filename sanitization for problematic recipe names."""
 
-    def test_sanitize_filename_slash(self):
-        """Forward slash should be replaced in filenames."""
-        from paprika_recipes.utils import sanitize_filename
-
-        assert "/" not in sanitize_filename("50/50 Mix")
-        assert sanitize_filename("50/50 Mix") == "50-50 Mix"
-
-    def test_sanitize_filename_backslash(self):
-        """Backslash should be replaced in filenames."""
-        from paprika_recipes.utils import sanitize_filename
-
-        assert "\\" not in sanitize_filename("Path\\Recipe")
-        assert sanitize_filename("Path\\Recipe") == "Path-Recipe"
-
-    def test_sanitize_filename_special_chars(self):
-        """Special characters should be replaced in filenames."""
-        from paprika_recipes.utils import sanitize_filename
-
-        result = sanitize_filename('Recipe: "Test" <special>')
-        assert ":" not in result
-        assert '"' not in result
-        assert "<" not in result
-        assert ">" not in result
-
-    def test_sanitize_filename_preserves_normal_chars(self):
-        """Normal characters should be preserved."""
-        from paprika_recipes.utils import sanitize_filename
-
-        assert sanitize_filename("Normal Recipe Name") == "Normal Recipe Name"
-        assert sanitize_filename("Recipe #1") == "Recipe #1"
-        assert sanitize_filename("Mom's Cookies") == "Mom's Cookies"
+    @pytest.mark.parametrize(
+        "name,expected",
+        [
+            # Slashes are replaced with dashes
+            ("50/50 Mix", "50-50 Mix"),
+            ("Path\\Recipe", "Path-Recipe"),
+            # Other special characters are replaced with underscores
+            ('Recipe: "Test" <special>', "Recipe_ _Test_ _special_"),
+            # Normal characters are preserved
+            ("Normal Recipe Name", "Normal Recipe Name"),
+            ("Recipe #1", "Recipe #1"),
+            ("Mom's Cookies", "Mom's Cookies"),
+        ],
+    )
+    def test_sanitize_filename(self, name, expected):
+        """Problematic characters should be replaced in filenames."""
+        assert sanitize_filename(name) == expected
 
 
 @pytest.mark.skipif(
     not REAL_RECIPES_DIR.exists(),
     reason="Real recipe data not available"
 )
+@pytest.mark.usefixtures("clear_parsed_recipe_files")
 class TestRealRecipeData:
     """Integration tests using real downloaded recipe data."""
 
     def get_recipe_files(self):
         """Get all recipe YAML files from test-download directory."""
-        return list(REAL_RECIPES_DIR.glob("*.paprikarecipe.yaml"))
+        return _RECIPE_FILES
 
     def test_real_recipes_load_without_error(self):
         """All real recipes should load without errors."""
@@ -387,42 +451,30 @@ class TestRealRecipeData:
         errors = []
         for recipe_file in recipe_files:
             try:
-                with open(recipe_file) as f:
-                    data = load_yaml(f)
-                    BaseRecipe.from_dict(data)
+                data = _load_recipe_file(recipe_file)
+                BaseRecipe.from_dict(data)
             except Exception as e:
                 errors.append(f"{recipe_file.name}: {e}")
 
         assert not errors, f"Failed to load {len(errors)} recipes:\n" + "\n".join(errors[:10])
 
-    def test_real_recipes_round_trip(self):
+    @pytest.mark.parametrize(
+        "recipe_file",
+        _RECIPE_FILES[:50],  # Test first 50 to keep fast
+        ids=lambda path: path.name,
+    )
+    def test_real_recipes_round_trip(self, recipe_file):
         """Real recipes should survive YAML round-trip."""
-        recipe_files = self.get_recipe_files()[:50]  # Test first 50 to keep fast
+        # Load original
+        original_data = _load_recipe_file(recipe_file)
+        original = BaseRecipe.from_dict(original_data)
 
-        errors = []
-        for recipe_file in recipe_files:
-            try:
-                # Load original
-                with open(recipe_file) as f:
-                    original_data = load_yaml(f)
-                original = BaseRecipe.from_dict(original_data)
-
-                # Round-trip
-                buffer = io.StringIO()
-                dump_recipe_yaml(original, buffer)
-                buffer.seek(0)
-                restored_data = load_yaml(buffer)
-                restored = BaseRecipe.from_dict(restored_data)
-
-                # Verify key fields
-                assert restored.name == original.name, f"Name mismatch in {recipe_file.name}"
-                assert restored.uid == original.uid, f"UID mismatch in {recipe_file.name}"
-                assert restored.ingredients == original.ingredients, f"Ingredients mismatch in {recipe_file.name}"
-
-            except Exception as e:
-                errors.append(f"{recipe_file.name}: {e}")
+        restored = _round_trip(original)
 
-        assert not errors, f"Round-trip failed for {len(errors)} recipes:\n" + "\n".join(errors[:10])
+        # Verify key fields
+        assert restored.name == original.name
+        assert restored.uid == original.uid
+        assert restored.ingredients == original.ingredients
 
     def test_real_recipes_have_required_fields(self):
         """All real recipes should have name and uid."""
@@ -430,8 +482,7 @@ class TestRealRecipeData:
 
         missing_fields = []
         for recipe_file in recipe_files:
-            with open(recipe_file) as f:
-                data = load_yaml(f)
+            data = _load_recipe_file(recipe_file)
 
             if not data.get("name"):
                 missing_fields.append(f"{recipe_file.name}: missing name")
@@ -445,8 +496,7 @@ class TestRealRecipeData:
         recipe_files = self.get_recipe_files()[:20]  # Test subset
 
         for recipe_file in recipe_files:
-            with open(recipe_file) as f:
-                data = load_yaml(f)
+            data = _load_recipe_file(recipe_file)
             recipe = BaseRecipe.from_dict(data)
 
             # Should not raise
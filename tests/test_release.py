@@ -7,7 +7,6 @@ Tests for:
 - Upload recipes (payload format verification)
 """
 
-import time
 from unittest.mock import patch
 
 import pytest
@@ -16,13 +15,46 @@ import responses
 from paprika_recipes.remote import Remote, RemoteRecipe, DEFAULT_MIN_REQUEST_INTERVAL
 
 
+@pytest.fixture
+def mock_api():
+    """Mocked Paprika API with the login and recipe list endpoints registered.
+
+    Tests add their own endpoints, or ``replace`` these, as needed.
+    """
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+        rsps.add(
+            responses.POST,
+            "https://www.paprikaapp.com/api/v1/account/login/",
+            json={"result": {"token": "test-token"}},
+            status=200,
+        )
+        rsps.add(
+            responses.GET,
+            "https://www.paprikaapp.com/api/v2/sync/recipes/",
+            json={"result": []},
+            status=200,
+        )
+        yield rsps
+
+
+@pytest.fixture
+def authed_remote():
+    """A Remote that already holds a bearer token, so no login is needed."""
+    remote = Remote(
+        email="test@example.com",
+        password="password123",
+        min_request_interval=0,
+    )
+    remote._bearer_token = "test-token"
+    return remote
+
+
 class TestAuthentication:
     """Test authentication and bearer token handling."""
 
-    @responses.activate
-    def test_login_returns_bearer_token(self):
+    def test_login_returns_bearer_token(self, mock_api):
         """Successful login should return and cache bearer token."""
-        responses.add(
+        mock_api.replace(
             responses.POST,
             "https://www.paprikaapp.com/api/v1/account/login/",
             json={"result": {"token": "test-bearer-token-123"}},
@@ -38,16 +70,8 @@ class TestAuthentication:
         token = remote.bearer_token
         assert token == "test-bearer-token-123"
 
-    @responses.activate
-    def test_bearer_token_is_cached(self):
+    def test_bearer_token_is_cached(self, mock_api):
         """Bearer token should be cached after first login."""
-        responses.add(
-            responses.POST,
-            "https://www.paprikaapp.com/api/v1/account/login/",
-            json={"result": {"token": "cached-token"}},
-            status=200,
-        )
-
         remote = Remote(
             email="test@example.com",
             password="password123",
@@ -59,15 +83,14 @@ class TestAuthentication:
         token2 = remote.bearer_token
 
         # Should only call API once
-        assert len(responses.calls) == 1
-        assert token1 == token2 == "cached-token"
+        assert len(mock_api.calls) == 1
+        assert token1 == token2 == "test-token"
 
-    @responses.activate
-    def test_login_failure_raises_error(self):
+    def test_login_failure_raises_error(self, mock_api):
         """Failed login should raise PaprikaError."""
         from paprika_recipes.exceptions import PaprikaError
 
-        responses.add(
+        mock_api.replace(
             responses.POST,
             "https://www.paprikaapp.com/api/v1/account/login/",
             status=401,
@@ -86,101 +109,41 @@ class TestAuthentication:
 class TestRateLimiting:
     """Test rate limiting between API requests."""
 
-    @responses.activate
-    def test_rate_limiting_delays_requests(self):
+    def test_rate_limiting_delays_requests(self, mock_api):
         """Requests should be delayed by min_request_interval."""
-        # Mock login
-        responses.add(
-            responses.POST,
-            "https://www.paprikaapp.com/api/v1/account/login/",
-            json={"result": {"token": "test-token"}},
-            status=200,
-        )
-        # Mock recipes list (called twice)
-        responses.add(
-            responses.GET,
-            "https://www.paprikaapp.com/api/v2/sync/recipes/",
-            json={"result": []},
-            status=200,
-        )
-        responses.add(
-            responses.GET,
-            "https://www.paprikaapp.com/api/v2/sync/recipes/",
-            json={"result": []},
-            status=200,
-        )
+        remote = Remote(email="test@example.com", password="password123")
+        remote._bearer_token = "test-token"
 
-        # Use short interval for faster test
-        min_interval = 0.1
-        remote = Remote(
-            email="test@example.com",
-            password="password123",
-            min_request_interval=min_interval,
-        )
-
-        # Make two requests and measure time
-        start = time.time()
-        remote.count()  # First request (login + recipes list)
-        remote.count()  # Second request (recipes list only, token cached)
-        elapsed = time.time() - start
+        # Each request reads the clock before and after; the second request
+        # starts 0.5s after the first one finished.
+        with patch("paprika_recipes.remote.time") as mock_time:
+            mock_time.monotonic.side_effect = [100.0, 100.0, 100.5, 100.5]
+            remote.count()
+            remote.count()
 
-        # Should have delayed at least min_interval between the two recipe list calls
-        assert elapsed >= min_interval, f"Expected delay of {min_interval}s, got {elapsed}s"
+        mock_time.sleep.assert_called_once()
+        (delay,) = mock_time.sleep.call_args.args
+        assert delay == pytest.approx(DEFAULT_MIN_REQUEST_INTERVAL - 0.5)
 
     def test_default_rate_limit_is_2_seconds(self):
         """Default rate limit should be 2 seconds."""
         assert DEFAULT_MIN_REQUEST_INTERVAL == 2.0
 
-    @responses.activate
-    def test_rate_limiting_can_be_disabled(self):
+    def test_rate_limiting_can_be_disabled(self, mock_api, authed_remote):
         """Rate limiting should be disableable with min_request_interval=0."""
-        responses.add(
-            responses.POST,
-            "https://www.paprikaapp.com/api/v1/account/login/",
-            json={"result": {"token": "test-token"}},
-            status=200,
-        )
-        responses.add(
-            responses.GET,
-            "https://www.paprikaapp.com/api/v2/sync/recipes/",
-            json={"result": []},
-            status=200,
-        )
-        responses.add(
-            responses.GET,
-            "https://www.paprikaapp.com/api/v2/sync/recipes/",
-            json={"result": []},
-            status=200,
-        )
-
-        remote = Remote(
-            email="test@example.com",
-            password="password123",
-            min_request_interval=0,  # Disabled
-        )
+        with patch("paprika_recipes.remote.time") as mock_time:
+            authed_remote.count()
+            authed_remote.count()
 
-        start = time.time()
-        remote.count()
-        remote.count()
-        elapsed = time.time() - start
-
-        # Should complete quickly without delay
-        assert elapsed < 0.5, f"Expected fast execution, got {elapsed}s"
+        mock_time.sleep.assert_not_called()
 
 
 class TestDownloadRecipes:
     """Test downloading recipes from API."""
 
-    @responses.activate
-    def test_get_recipe_list(self):
+    def test_get_recipe_list(self, mock_api, authed_remote):
         """Should fetch and parse recipe list from API."""
-        responses.add(
-            responses.POST,
-            "https://www.paprikaapp.com/api/v1/account/login/",
-            json={"result": {"token": "test-token"}},
-            status=200,
-        )
-        responses.add(
+        mock_api.replace(
             responses.GET,
             "https://www.paprikaapp.com/api/v2/sync/recipes/",
             json={
@@ -192,25 +155,12 @@ class TestDownloadRecipes:
             status=200,
         )
 
-        remote = Remote(
-            email="test@example.com",
-            password="password123",
-            min_request_interval=0,
-        )
-
-        count = remote.count()
+        count = authed_remote.count()
         assert count == 2
 
-    @responses.activate
-    def test_get_recipe_by_id(self):
+    def test_get_recipe_by_id(self, mock_api, authed_remote):
         """Should fetch individual recipe details."""
-        responses.add(
-            responses.POST,
-            "https://www.paprikaapp.com/api/v1/account/login/",
-            json={"result": {"token": "test-token"}},
-            status=200,
-        )
-        responses.add(
+        mock_api.add(
             responses.GET,
             "https://www.paprikaapp.com/api/v2/sync/recipe/recipe-123/",
             json={
@@ -225,13 +175,7 @@ class TestDownloadRecipes:
             status=200,
         )
 
-        remote = Remote(
-            email="test@example.com",
-            password="password123",
-            min_request_interval=0,
-        )
-
-        recipe = remote.get_recipe_by_id("recipe-123", "abc123")
+        recipe = authed_remote.get_recipe_by_id("recipe-123", "abc123")
         assert recipe.name == "Test Recipe"
         assert recipe.ingredients == "1 cup flour"
         assert recipe.directions == "Mix well"
@@ -240,26 +184,19 @@ class TestDownloadRecipes:
 class TestUploadRecipes:
     """Test uploading recipes to API."""
 
-    @responses.activate
-    def test_upload_recipe_sends_gzipped_json(self):
+    def test_upload_recipe_sends_gzipped_json(self, mock_api, authed_remote):
         """Upload should send recipe as gzipped JSON."""
         import gzip
         import json
 
-        responses.add(
-            responses.POST,
-            "https://www.paprikaapp.com/api/v1/account/login/",
-            json={"result": {"token": "test-token"}},
-            status=200,
-        )
-        responses.add(
+        mock_api.add(
             responses.POST,
             "https://www.paprikaapp.com/api/v2/sync/recipe/test-uid-123/",
             json={"result": {}},
             status=200,
         )
         # Mock the get_recipe_by_id call after upload
-        responses.add(
+        mock_api.add(
             responses.GET,
             "https://www.paprikaapp.com/api/v2/sync/recipe/test-uid-123/",
             json={
@@ -272,60 +209,41 @@ class TestUploadRecipes:
             status=200,
         )
 
-        remote = Remote(
-            email="test@example.com",
-            password="password123",
-            min_request_interval=0,
-        )
-
         recipe = RemoteRecipe(
             uid="test-uid-123",
             name="Uploaded Recipe",
             ingredients="Test ingredients",
         )
 
-        result = remote.upload_recipe(recipe)
+        result = authed_remote.upload_recipe(recipe)
 
         # Verify upload request was made
-        upload_call = responses.calls[1]  # Second call after login
+        upload_call = mock_api.calls[0]
         assert upload_call.request.url == "https://www.paprikaapp.com/api/v2/sync/recipe/test-uid-123/"
 
         # Verify returned recipe
         assert result.uid == "test-uid-123"
         assert result.name == "Uploaded Recipe"
 
-    @responses.activate
-    def test_upload_recipe_updates_hash(self):
+    def test_upload_recipe_updates_hash(self, mock_api, authed_remote):
         """Upload should update recipe hash before sending."""
-        responses.add(
-            responses.POST,
-            "https://www.paprikaapp.com/api/v1/account/login/",
-            json={"result": {"token": "test-token"}},
-            status=200,
-        )
-        responses.add(
+        mock_api.add(
             responses.POST,
             "https://www.paprikaapp.com/api/v2/sync/recipe/test-uid/",
             json={"result": {}},
             status=200,
         )
-        responses.add(
+        mock_api.add(
             responses.GET,
             "https://www.paprikaapp.com/api/v2/sync/recipe/test-uid/",
             json={"result": {"uid": "test-uid", "name": "Test", "hash": "updated"}},
             status=200,
         )
 
-        remote = Remote(
-            email="test@example.com",
-            password="password123",
-            min_request_interval=0,
-        )
-
         recipe = RemoteRecipe(uid="test-uid", name="Test")
         original_hash = recipe.hash
 
-        remote.upload_recipe(recipe)
+        authed_remote.upload_recipe(recipe)
 
         # Hash should have been recalculated
         assert recipe.hash != original_hash
@@ -334,55 +252,71 @@ class TestUploadRecipes:
 class TestNotify:
     """Test notify API call."""
 
-    @responses.activate
-    def test_notify_calls_sync_endpoint(self):
+    def test_notify_calls_sync_endpoint(self, mock_api, authed_remote):
         """Notify should call the sync notify endpoint."""
-        responses.add(
-            responses.POST,
-            "https://www.paprikaapp.com/api/v1/account/login/",
-            json={"result": {"token": "test-token"}},
-            status=200,
-        )
-        responses.add(
+        mock_api.add(
             responses.POST,
             "https://www.paprikaapp.com/api/v2/sync/notify/",
             json={"result": {}},
             status=200,
         )
 
-        remote = Remote(
-            email="test@example.com",
-            password="password123",
-            min_request_interval=0,
-        )
-
-        remote.notify()
+        authed_remote.notify()
 
         # Verify notify endpoint was called
-        assert any("/sync/notify/" in call.request.url for call in responses.calls)
+        assert any("/sync/notify/" in call.request.url for call in mock_api.calls)
 
 
 class TestKeyringStorage:
     """Test password storage with keyring."""
 
-    def test_keyring_stores_password(self):
-        """Password should be stored in keyring after successful auth."""
+    @pytest.fixture(autouse=True)
+    def _stub_keyring(self, monkeypatch):
+        """Keep passwords in memory rather than in the system keyring."""
         import keyring
-        from paprika_recipes.constants import APP_NAME
 
-        # Use a test email that won't conflict
-        test_email = "test-keyring@example.com"
-        test_password = "test-password-123"
+        store = {}
+        monkeypatch.setattr(
+            keyring,
+            "set_password",
+            lambda service, username, password: store.__setitem__(
+                (service, username), password
+            ),
+        )
+        monkeypatch.setattr(
+            keyring,
+            "get_password",
+            lambda service, username: store.get((service, username)),
+        )
+        monkeypatch.setattr(
+            keyring,
+            "delete_password",
+            lambda service, username: store.pop((service, username), None),
+        )
 
-        # Store password
-        keyring.set_password(APP_NAME, test_email, test_password)
+    def test_keyring_stores_password(self, mock_api):
+        """store-password should save the password in keyring after successful auth."""
+        import argparse
 
-        # Retrieve and verify
-        retrieved = keyring.get_password(APP_NAME, test_email)
-        assert retrieved == test_password
+        from paprika_recipes.commands.store_password import Command
+        from paprika_recipes.utils import get_password_for_email
 
-        # Clean up
-        keyring.delete_password(APP_NAME, test_email)
+        test_email = "test-keyring@example.com"
+        test_password = "test-password-123"
+
+        command = Command(config={}, options=argparse.Namespace())
+        with patch("builtins.input", return_value=test_email), patch(
+            "paprika_recipes.commands.store_password.getpass",
+            return_value=test_password,
+        ), patch(
+            "paprika_recipes.commands.store_password.questionary.confirm"
+        ) as mock_confirm:
+            mock_confirm.return_value.ask.return_value = False  # Not the default
+            command.handle()
+
+        # Password is only stored once login succeeded
+        assert len(mock_api.calls) == 1
+        assert get_password_for_email(test_email) == test_password
 
     def test_get_password_for_email(self):
         """get_password_for_email should retrieve from keyring."""